@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+author: ZengFanyu
+email: 3024826049@qq.com
+date: 2025/06/05
+
+update:
+V0.6.0
+- add sunlit/eclipse and beta-angle analysis with an offline analytic Sun model
+"""
+import numpy as np
+
+AU_KM = 149597870.7
+SUN_RADIUS = 696000.0
+EARTH_RADIUS = 6378.137
+# 阴影状态
+SUNLIT, PENUMBRA, UMBRA = 0, 1, 2
+# 阴影状态 -> (绘图颜色, 图例名称)
+SHADOW_STYLES = {
+    SUNLIT: ('red', 'Sunlit'),
+    PENUMBRA: ('orange', 'Penumbra'),
+    UMBRA: ('navy', 'Umbra'),
+}
+
+
+def sun_position(jd_tt):
+    """低精度解析太阳位置（天文年历公式，精度约0.01°），无需下载JPL星历
+
+    返回 GCRS(J2000平赤道) 下的地心太阳位置(km)，形状 (时间点数, 3)
+    """
+    days = np.asarray(jd_tt, dtype=np.float64) - 2451545.0
+    mean_longitude = 280.460 + 0.9856474 * days
+    mean_anomaly = np.radians(357.528 + 0.9856003 * days)
+    # 黄经由历元平春分点改到J2000春分点（扣除黄经岁差）
+    ecliptic_longitude = np.radians(mean_longitude + 1.915 * np.sin(mean_anomaly)
+                                    + 0.020 * np.sin(2 * mean_anomaly)
+                                    - 1.397 * days / 36525.0)
+    distance = (1.00014 - 0.01671 * np.cos(mean_anomaly)
+                - 0.00014 * np.cos(2 * mean_anomaly)) * AU_KM
+    obliquity = np.radians(23.439291)
+    return np.stack([distance * np.cos(ecliptic_longitude),
+                     distance * np.cos(obliquity) * np.sin(ecliptic_longitude),
+                     distance * np.sin(obliquity) * np.sin(ecliptic_longitude)], axis=-1)
+
+
+def shadow_geometry(positions, sun, model='conical'):
+    """从卫星看去的地心-日心角距与地球、太阳视半径(rad)，形状均为 (卫星数, 时间点数)
+
+    两圆盘重叠即处于半影，地球圆盘完全遮住太阳即处于本影，与本影/半影锥判断等价且随时间连续；
+    'cylindrical' 圆柱模型视太阳为无穷远点光源（视半径为0），'conical' 圆锥模型考虑太阳视半径
+    """
+    if model not in ('cylindrical', 'conical'):
+        raise ValueError(f"未知的地影模型: {model}")
+    positions = positions.astype(np.float64)
+    radius = np.linalg.norm(positions, axis=-1)
+    if model == 'cylindrical':
+        to_sun = np.broadcast_to(sun, positions.shape)
+    else:
+        to_sun = sun - positions
+    sun_distance = np.linalg.norm(to_sun, axis=-1)
+    cos_separation = -np.einsum('stj,stj->st', positions, to_sun) / (radius * sun_distance)
+    separation = np.arccos(np.clip(cos_separation, -1.0, 1.0))
+    earth_angle = np.arcsin(np.minimum(EARTH_RADIUS / radius, 1.0))
+    sun_angle = np.zeros_like(separation) if model == 'cylindrical' else np.arcsin(SUN_RADIUS / sun_distance)
+    return separation, earth_angle, sun_angle
+
+
+def _flags_from_geometry(separation, earth_angle, sun_angle):
+    """由角距与视半径得到 SUNLIT/PENUMBRA/UMBRA 标志"""
+    flags = np.full(separation.shape, SUNLIT, dtype=np.uint8)
+    flags[separation < earth_angle + sun_angle] = PENUMBRA
+    flags[separation < earth_angle - sun_angle] = UMBRA
+    return flags
+
+
+def shadow_flags(positions, sun, model='conical'):
+    """对整块位置数组做地影判断
+
+    positions: (卫星数, 时间点数, 3) km；sun: (时间点数, 3) km
+    model: 'cylindrical' 圆柱模型（无半影）或 'conical' 圆锥模型
+    返回 SUNLIT/PENUMBRA/UMBRA 标志，形状 (卫星数, 时间点数)
+    """
+    return _flags_from_geometry(*shadow_geometry(positions, sun, model))
+
+
+def beta_angle(positions, velocities, sun):
+    """太阳方向与轨道面的夹角β(deg)，形状 (卫星数, 时间点数)"""
+    momentum = np.cross(positions.astype(np.float64), velocities.astype(np.float64))
+    momentum /= np.linalg.norm(momentum, axis=-1, keepdims=True)
+    sun_unit = sun / np.linalg.norm(sun, axis=-1, keepdims=True)
+    return np.degrees(np.arcsin(np.clip(np.einsum('stj,tj->st', momentum, sun_unit), -1.0, 1.0)))
+
+
+def shadow_track(values, flags, flag):
+    """只保留指定阴影状态的轨迹点，其余置为NaN以便分段着色
+
+    每段向后多保留一个点，使不同颜色的轨迹首尾相接
+    """
+    keep = flags == flag
+    keep[1:] |= keep[:-1]
+    return np.where(keep, values, np.nan)
+
+
+class EclipseAnalysis:
+    """基于 Ephemeris 的地影分析：太阳位置按时间网格只计算一次，整块判断所有卫星"""
+    __slots__ = ('ephemeris', 'model', 'sun', 'flags', 'margin', 'beta')
+
+    def __init__(self, ephemeris, model='conical'):
+        self.ephemeris = ephemeris
+        self.model = model
+        self.sun = sun_position(ephemeris.julian_dates_tt)
+        separation, earth_angle, sun_angle = shadow_geometry(ephemeris.positions, self.sun, model)
+        self.flags = _flags_from_geometry(separation, earth_angle, sun_angle)
+        # 距地影边界的角度余量(rad)，负值表示处于地影中，用于插值进出地影时刻
+        self.margin = separation - (earth_angle + sun_angle)
+        self.beta = beta_angle(ephemeris.positions, ephemeris.velocities, self.sun)
+
+    @property
+    def eclipsed(self):
+        """是否处于地影（半影或本影），形状 (卫星数, 时间点数)"""
+        return self.flags != SUNLIT
+
+    def intervals(self, index=0):
+        """第index颗卫星的地影区间列表 [(进入, 离开), ...]，单位为相对 epoch_utc 的秒数
+
+        进出时刻由相邻采样点的角度余量线性插值得到；起止时刻仍在地影中的区间按网格端点截断
+        """
+        eclipsed = np.concatenate(([False], self.eclipsed[index], [False]))
+        edges = np.flatnonzero(np.diff(eclipsed.astype(np.int8)))
+        offsets = self.ephemeris.offsets
+        margin = self.margin[index]
+
+        def crossing(before, after):
+            fraction = margin[before] / (margin[before] - margin[after])
+            return float(offsets[before] + fraction * (offsets[after] - offsets[before]))
+
+        return [(float(offsets[0]) if start == 0 else crossing(start - 1, start),
+                 float(offsets[-1]) if stop == len(offsets) else crossing(stop - 1, stop))
+                for start, stop in zip(edges[::2], edges[1::2])]
+
+    def eclipse_fraction(self):
+        """各卫星处于地影的采样点比例"""
+        return self.eclipsed.mean(axis=-1)
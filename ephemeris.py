@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+author: ZengFanyu
+email: 3024826049@qq.com
+date: 2025/06/05
+
+update:
+V0.5.0
+- add compact array-backed ephemeris container
+"""
+from datetime import timezone
+from numbers import Integral, Real
+import numpy as np
+from skyfield.api import load
+from skyfield.framelib import itrs
+
+# WGS84 椭球参数
+WGS84_RADIUS = 6378.137
+WGS84_FLATTENING = 1 / 298.257223563
+
+
+class Ephemeris:
+    """紧凑星历容器：按数组保存多颗卫星的位置/速度，派生量惰性计算并缓存
+
+    positions/velocities 形状为 (卫星数, 时间点数, 3)，单位 km 与 km/s（GCRS坐标系）；
+    offsets 为相对 epoch_utc 的秒数。按卫星/时间窗口切片返回视图，不复制数据。
+    """
+    __slots__ = ('names', 'epoch_utc', 'epoch_tt', 'offsets', 'positions', 'velocities', '_cache')
+
+    def __init__(self, names, epoch_utc, epoch_tt, offsets, positions, velocities, cache=None):
+        self.names = names
+        self.epoch_utc = epoch_utc
+        self.epoch_tt = epoch_tt
+        self.offsets = offsets
+        self.positions = positions
+        self.velocities = velocities
+        self._cache = cache if cache is not None else {}
+
+    @classmethod
+    def from_satellites(cls, satellites, time_points, ts=None, dtype=np.float32):
+        """传播卫星并构建星历，skyfield 的中间对象用完即弃"""
+        ts = ts or load.timescale()
+        times = ts.utc(time_points)
+        epoch_utc = time_points[0]
+        if epoch_utc.tzinfo is None:
+            epoch_utc = epoch_utc.replace(tzinfo=timezone.utc)
+        offsets = np.array([(moment - time_points[0]).total_seconds() for moment in time_points])
+        shape = (len(satellites), len(time_points), 3)
+        positions = np.empty(shape, dtype=dtype)
+        velocities = np.empty(shape, dtype=dtype)
+        for i, sat in enumerate(satellites):
+            geocentric = sat.at(times)
+            positions[i] = geocentric.position.km.T
+            velocities[i] = geocentric.velocity.km_per_s.T
+        names = [getattr(sat, 'name', 'Unknown Satellite') for sat in satellites]
+        return cls(names, epoch_utc, float(times.tt[0]), offsets, positions, velocities)
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def sample_count(self):
+        """时间点数"""
+        return len(self.offsets)
+
+    @property
+    def julian_dates_tt(self):
+        """各时间点的TT儒略日"""
+        return self.epoch_tt + self.offsets / 86400.0
+
+    def _derived(self, key, compute):
+        """惰性计算并缓存派生量"""
+        if key not in self._cache:
+            self._cache.update(compute())
+        return self._cache[key]
+
+    def _geodetic(self):
+        """GCRS -> ITRS -> WGS84 大地坐标（纬度/经度/高度）"""
+        # GCRS->ITRS 旋转矩阵只在此处使用，按需计算而不随星历保存
+        times = load.timescale().tt_jd(self.epoch_tt, self.offsets / 86400.0)
+        rotations = np.moveaxis(itrs.rotation_at(times), -1, 0)
+        xyz = np.einsum('tij,stj->sti', rotations, self.positions, dtype=np.float64)
+        x, y, z = xyz[..., 0], xyz[..., 1], xyz[..., 2]
+        e2 = WGS84_FLATTENING * (2 - WGS84_FLATTENING)
+        p = np.hypot(x, y)
+        lat = np.arctan2(z, p * (1 - e2))
+        # 定点迭代，3次即可收敛到毫米级
+        for _ in range(3):
+            sin_lat = np.sin(lat)
+            n = WGS84_RADIUS / np.sqrt(1 - e2 * sin_lat * sin_lat)
+            height = p / np.cos(lat) - n
+            lat = np.arctan2(z, p * (1 - e2 * n / (n + height)))
+        sin_lat = np.sin(lat)
+        n = WGS84_RADIUS / np.sqrt(1 - e2 * sin_lat * sin_lat)
+        height = p * np.cos(lat) + z * sin_lat - n * (1 - e2 * sin_lat * sin_lat)
+        dtype = self.positions.dtype
+        return {'latitude': np.degrees(lat).astype(dtype),
+                'longitude': np.degrees(np.arctan2(y, x)).astype(dtype),
+                'altitude': height.astype(dtype)}
+
+    @property
+    def latitude(self):
+        """星下点纬度(deg)，形状 (卫星数, 时间点数)"""
+        return self._derived('latitude', self._geodetic)
+
+    @property
+    def longitude(self):
+        """星下点经度(deg)，形状 (卫星数, 时间点数)"""
+        return self._derived('longitude', self._geodetic)
+
+    @property
+    def altitude(self):
+        """WGS84 大地高度(km)，形状 (卫星数, 时间点数)"""
+        return self._derived('altitude', self._geodetic)
+
+    @property
+    def speed(self):
+        """惯性系速度大小(km/s)，形状 (卫星数, 时间点数)"""
+        return self._derived('speed', lambda: {'speed': np.linalg.norm(self.velocities, axis=-1)})
+
+    def _slice(self, sat_key, time_key):
+        """按卫星/时间切片；切片与整数下标返回视图，已缓存的派生量一并切片"""
+        if isinstance(sat_key, Integral):
+            sat_key = int(sat_key)
+            sat_key = slice(sat_key, sat_key + 1 or None)
+        names = self.names[sat_key] if isinstance(sat_key, slice) else [self.names[i] for i in sat_key]
+        cache = {key: value[sat_key, time_key] for key, value in self._cache.items()}
+        return Ephemeris(names, self.epoch_utc, self.epoch_tt, self.offsets[time_key],
+                         self.positions[sat_key, time_key], self.velocities[sat_key, time_key], cache)
+
+    def satellites(self, key):
+        """按卫星编号（整数/切片/编号列表）选取；编号列表会复制数据"""
+        return self._slice(key, slice(None))
+
+    def window(self, start=None, stop=None):
+        """按时间窗口选取，start/stop 为 datetime 或相对 epoch_utc 的秒数，返回视图"""
+        bounds = []
+        for bound in (start, stop):
+            if bound is not None and not isinstance(bound, Real):
+                bound = (bound - self.epoch_utc).total_seconds()
+            bounds.append(bound)
+        first = 0 if bounds[0] is None else int(np.searchsorted(self.offsets, bounds[0], side='left'))
+        last = len(self.offsets) if bounds[1] is None else int(np.searchsorted(self.offsets, bounds[1], side='right'))
+        return self._slice(slice(None), slice(first, last))
+
+    def memory_report(self):
+        """各数组占用字节数（视图按其覆盖范围统计），含每个卫星-时间点的平均字节数"""
+        report = {'offsets': self.offsets.nbytes,
+                  'positions': self.positions.nbytes,
+                  'velocities': self.velocities.nbytes}
+        report.update({f'cache.{key}': value.nbytes for key, value in self._cache.items()})
+        report['total'] = sum(report.values())
+        samples = len(self.names) * len(self.offsets)
+        report['per_sample'] = report['total'] / samples if samples else 0.0
+        return report
@@ -5,6 +5,12 @@ email: 3024826049@qq.com
 date: 2025/06/05
 
 update:
+V0.6.0
+- show sunlit/penumbra/umbra segments and eclipse statistics
+V0.5.0
+- keep orbit results in a compact Ephemeris instead of skyfield position objects
+V0.4.0
+- filter satellites by orbital elements (regime/inclination/epoch age ...)
 V0.3.0
 - add GUI
 - allow users to download TLE files from a website
@@ -21,15 +27,34 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import plotly.graph_objects as go
 from cartopy import crs
-from typing import Optional, List, Any
+from typing import Optional, List
+from orbit_index import OrbitElementIndex
+from ephemeris import Ephemeris
+from eclipse import EclipseAnalysis, SHADOW_STYLES, shadow_track
 
 class SatelliteGUI:
     """Gui主类"""
+    # 筛选字段显示名称 -> OrbitElementIndex 字段
+    FILTER_FIELDS = {
+        "倾角(deg)": 'inclination',
+        "周期(min)": 'period',
+        "半长轴(km)": 'semi_major_axis',
+        "远地点高度(km)": 'apogee',
+        "近地点高度(km)": 'perigee',
+        "偏心率": 'eccentricity',
+        "升交点赤经(deg)": 'raan',
+        "GEO定点经度(deg)": 'longitude',
+        "历元龄期(天)": 'epoch_age',
+    }
     def __init__(self, self_root):
         self.status_var: Optional[tk.StringVar] = None
         self.display_frame: Optional[ttk.LabelFrame] = None
         self.hours_var: Optional[tk.StringVar] = None
         self.satellite_listbox: Optional[tk.Listbox] = None
+        self.regime_var: Optional[tk.StringVar] = None
+        self.filter_field_var: Optional[tk.StringVar] = None
+        self.filter_low_var: Optional[tk.StringVar] = None
+        self.filter_high_var: Optional[tk.StringVar] = None
         self.progress_bar: Optional[ttk.Progressbar] = None
         self.progress_var = tk.DoubleVar()
         self.root = self_root
@@ -38,9 +63,11 @@ class SatelliteGUI:
         # 数据存储
         self.satellites: List[EarthSatellite] = []
         self.selected_satellite: Optional[EarthSatellite] = None
+        self.index: Optional[OrbitElementIndex] = None
+        self.filtered_indices: List[int] = []
         self.ts = load.timescale()
-        self.geocentric: Optional[Any] = None
-        self.subpoint: Optional[Any] = None
+        self.ephemeris: Optional[Ephemeris] = None
+        self.eclipse: Optional[EclipseAnalysis] = None
         # 创建界面
         self.create_widgets()
 
@@ -68,6 +95,26 @@ class SatelliteGUI:
         self.satellite_listbox = tk.Listbox(satellite_frame, height=8)
         self.satellite_listbox.pack(fill=tk.BOTH, expand=True)
         self.satellite_listbox.bind('<<ListboxSelect>>', self.on_satellite_select)
+        # 轨道根数筛选区域
+        filter_frame = ttk.LabelFrame(control_frame, text="轨道筛选")
+        filter_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(filter_frame, text="轨道类型:").pack()
+        self.regime_var = tk.StringVar(value="全部")
+        ttk.Combobox(filter_frame, textvariable=self.regime_var, state="readonly",
+                     values=("全部",) + OrbitElementIndex.REGIMES).pack(fill=tk.X)
+        ttk.Label(filter_frame, text="筛选字段:").pack()
+        self.filter_field_var = tk.StringVar(value=next(iter(self.FILTER_FIELDS)))
+        ttk.Combobox(filter_frame, textvariable=self.filter_field_var, state="readonly",
+                     values=tuple(self.FILTER_FIELDS)).pack(fill=tk.X)
+        range_frame = ttk.Frame(filter_frame)
+        range_frame.pack(fill=tk.X, pady=2)
+        self.filter_low_var = tk.StringVar()
+        self.filter_high_var = tk.StringVar()
+        ttk.Entry(range_frame, textvariable=self.filter_low_var, width=10).pack(side=tk.LEFT, expand=True)
+        ttk.Label(range_frame, text="~").pack(side=tk.LEFT)
+        ttk.Entry(range_frame, textvariable=self.filter_high_var, width=10).pack(side=tk.LEFT, expand=True)
+        ttk.Button(filter_frame, text="应用筛选", command=self.apply_filter).pack(fill=tk.X, pady=2)
+        ttk.Button(filter_frame, text="清除筛选", command=self.reset_filter).pack(fill=tk.X, pady=2)
         # 时间设置区域
         time_frame = ttk.LabelFrame(control_frame, text="时间设置")
         time_frame.pack(fill=tk.X, pady=5)
@@ -204,6 +251,8 @@ class SatelliteGUI:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             self.satellites = self.parse_tle(content)
+            self.index = OrbitElementIndex(self.satellites)
+            self.filtered_indices = list(range(len(self.satellites)))
             self.update_satellite_list()
             if self.status_var:
                 self.status_var.set(f"已加载 {len(self.satellites)} 颗卫星")
@@ -228,18 +277,54 @@ class SatelliteGUI:
         """更新卫星列表显示"""
         if self.satellite_listbox:
             self.satellite_listbox.delete(0, tk.END)
-            for sat in self.satellites:
+            for i in self.filtered_indices:
+                sat = self.satellites[i]
                 sat_name = getattr(sat, 'name', 'Unknown Satellite')
                 self.satellite_listbox.insert(tk.END, sat_name)
     def on_satellite_select(self, event):
         """卫星选择事件处理"""
         selection = event.widget.curselection()
         if selection:
-            index = selection[0]
+            index = self.filtered_indices[selection[0]]
             self.selected_satellite = self.satellites[index]
             if self.status_var and self.selected_satellite:
                 sat_name = getattr(self.selected_satellite, 'name', 'Unknown Satellite')
                 self.status_var.set(f"已选择卫星: {sat_name}")
+    def apply_filter(self):
+        """按轨道根数筛选卫星列表"""
+        if not self.index:
+            messagebox.showwarning("警告", "请先加载TLE文件")
+            return
+        ranges = {}
+        try:
+            low_text = self.filter_low_var.get().strip() if self.filter_low_var else ""
+            high_text = self.filter_high_var.get().strip() if self.filter_high_var else ""
+            low = float(low_text) if low_text else None
+            high = float(high_text) if high_text else None
+        except ValueError:
+            messagebox.showerror("错误", "请输入有效的筛选范围")
+            return
+        if low is not None or high is not None:
+            field_name = self.filter_field_var.get() if self.filter_field_var else ""
+            ranges[self.FILTER_FIELDS[field_name]] = (low, high)
+        regime = self.regime_var.get() if self.regime_var else "全部"
+        indices = self.index.query(regime=None if regime == "全部" else regime, **ranges)
+        self.filtered_indices = indices.tolist()
+        self.update_satellite_list()
+        if self.status_var:
+            self.status_var.set(f"筛选出 {len(self.filtered_indices)}/{len(self.satellites)} 颗卫星")
+    def reset_filter(self):
+        """清除筛选条件"""
+        if self.regime_var:
+            self.regime_var.set("全部")
+        if self.filter_low_var:
+            self.filter_low_var.set("")
+        if self.filter_high_var:
+            self.filter_high_var.set("")
+        self.filtered_indices = list(range(len(self.satellites)))
+        self.update_satellite_list()
+        if self.status_var:
+            self.status_var.set(f"已加载 {len(self.satellites)} 颗卫星")
     def calculate_orbit(self):
         """计算卫星轨道"""
         if not self.selected_satellite:
@@ -264,14 +349,16 @@ class SatelliteGUI:
             time_points.append(current_time)
             current_time += delta
         # 计算位置
-        time_array = self.ts.utc(time_points)
-        self.geocentric = self.selected_satellite.at(time_array)
-        self.subpoint = getattr(self.geocentric, 'subpoint', lambda: None)()
+        self.ephemeris = Ephemeris.from_satellites([self.selected_satellite], time_points, self.ts)
+        self.eclipse = EclipseAnalysis(self.ephemeris)
         if self.status_var:
-            self.status_var.set(f"轨道计算完成 ({len(time_points)} 个点)")
+            self.status_var.set(f"轨道计算完成 ({len(time_points)} 个点, "
+                                f"地影 {len(self.eclipse.intervals(0))} 次, "
+                                f"地影占比 {self.eclipse.eclipse_fraction()[0]:.1%}, "
+                                f"β角 {self.eclipse.beta[0, 0]:.1f}°)")
     def show_2d_plot(self):
         """显示2D轨迹图"""
-        if not self.subpoint:
+        if not self.ephemeris:
             messagebox.showwarning("警告", "请先计算轨道")
             return
         # 清除显示区域
@@ -285,24 +372,25 @@ class SatelliteGUI:
         getattr(ax, 'stock_img', lambda: None)()  # type: ignore
         getattr(ax, 'coastlines', lambda: None)()  # type: ignore
         # 绘制轨迹
-        longitude_data = getattr(self.subpoint, 'longitude', None)
-        latitude_data = getattr(self.subpoint, 'latitude', None)
-        if longitude_data and latitude_data:
-            lon_degrees = getattr(longitude_data, 'degrees', [])
-            lat_degrees = getattr(latitude_data, 'degrees', [])
-            ax.plot(lon_degrees, lat_degrees,
-                    'r-', transform=crs.Geodetic(),
-                    linewidth=2, label=self.selected_satellite.name if self.selected_satellite else "Unknown")
-            # 标记起终点
-            if len(lon_degrees) > 0 and len(lat_degrees) > 0:
-                ax.plot(lon_degrees[0], lat_degrees[0],
-                        'go', transform=crs.Geodetic(),
-                        markersize=8, label='Start')
-                ax.plot(lon_degrees[-1], lat_degrees[-1],
-                        'bo', transform=crs.Geodetic(),
-                        markersize=8, label='End')
+        lon_degrees = self.ephemeris.longitude[0]
+        lat_degrees = self.ephemeris.latitude[0]
+        flags = self.eclipse.flags[0] if self.eclipse else np.zeros(len(lon_degrees), dtype=np.uint8)
+        for flag, (color, state) in SHADOW_STYLES.items():
+            if not (flags == flag).any():
+                continue
+            ax.plot(shadow_track(lon_degrees, flags, flag), shadow_track(lat_degrees, flags, flag),
+                    '-', color=color, transform=crs.Geodetic(),
+                    linewidth=2, label=f'{self.ephemeris.names[0]} ({state})')
+        # 标记起终点
+        if len(lon_degrees) > 0:
+            ax.plot(lon_degrees[0], lat_degrees[0],
+                    'go', transform=crs.Geodetic(),
+                    markersize=8, label='Start')
+            ax.plot(lon_degrees[-1], lat_degrees[-1],
+                    'bo', transform=crs.Geodetic(),
+                    markersize=8, label='End')
         ax.legend()
-        plt.title(f"{self.selected_satellite.name if self.selected_satellite else 'Unknown'}")
+        plt.title(self.ephemeris.names[0])
         # 嵌入到GUI
         if self.display_frame:
             canvas = FigureCanvasTkAgg(fig, self.display_frame)
@@ -310,18 +398,11 @@ class SatelliteGUI:
             canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
     def show_3d_plot(self):
         """显示3D轨道图"""
-        if not self.geocentric:
+        if not self.ephemeris:
             messagebox.showwarning("警告", "请先计算轨道")
             return
         # 创建3D图形
-        position_obj = getattr(self.geocentric, 'position', None)
-        if not position_obj:
-            messagebox.showerror("错误", "无法获取位置数据")
-            return
-        position_km = getattr(position_obj, 'km', None)
-        if position_km is None:
-            messagebox.showerror("错误", "无法获取公里单位的位置数据")
-            return
+        position_km = self.ephemeris.positions[0]
         earth_radius = 6378.1
         # 创建地球表面
         theta = np.linspace(0, 2 * np.pi, 50)
@@ -369,17 +450,18 @@ class SatelliteGUI:
             ))
         # 添加卫星轨道
         try:
-            # 安全地访问位置数组
-            x_pos = position_km[0] if hasattr(position_km, '__getitem__') and len(position_km) > 0 else []
-            y_pos = position_km[1] if hasattr(position_km, '__getitem__') and len(position_km) > 1 else []
-            z_pos = position_km[2] if hasattr(position_km, '__getitem__') and len(position_km) > 2 else []
-            
-            fig.add_trace(go.Scatter3d(
-                x=x_pos, y=y_pos, z=z_pos,
-                mode='lines',
-                line={'color': 'red', 'width': 4},
-                name=f'{self.selected_satellite.name if self.selected_satellite else "Unknown"} 轨道'
-            ))
+            flags = self.eclipse.flags[0] if self.eclipse else np.zeros(len(position_km), dtype=np.uint8)
+            for flag, (color, state) in SHADOW_STYLES.items():
+                if not (flags == flag).any():
+                    continue
+                fig.add_trace(go.Scatter3d(
+                    x=shadow_track(position_km[:, 0], flags, flag),
+                    y=shadow_track(position_km[:, 1], flags, flag),
+                    z=shadow_track(position_km[:, 2], flags, flag),
+                    mode='lines',
+                    line={'color': color, 'width': 4},
+                    name=f'{self.ephemeris.names[0]} 轨道 ({state})'
+                ))
         except (IndexError, TypeError) as e:
             messagebox.showerror("错误", f"处理位置数据时出错: {str(e)}")
             return
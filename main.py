@@ -5,6 +5,12 @@ email: 3024826049@qq.com
 date: 2025/06/05
 
 update:
+V0.6.0
+- sunlit/eclipse analysis, color eclipsed segments in 2D and 3D plots
+V0.5.0
+- store propagation results in a compact array-backed Ephemeris
+V0.4.0
+- build orbital-element index at TLE load time, filter satellites without propagation
 V0.3.0
 - add GUI in gui.py
 V0.2.1
@@ -26,6 +32,9 @@ import matplotlib.pyplot as plt
 import plotly.graph_objects as go
 import tkinter as tk
 from gui import SatelliteGUI
+from orbit_index import OrbitElementIndex
+from ephemeris import Ephemeris
+from eclipse import EclipseAnalysis, SHADOW_STYLES, shadow_track
 
 
 class TLEFileSelector:
@@ -67,10 +76,11 @@ class SatelliteTracker:
     """卫星轨道仿真相关工具类"""
     def __init__(self, tle_file_content):
         self.satellites = self._parse_tle(tle_file_content)
+        self.index = OrbitElementIndex(self.satellites)
         self.selected_satellite = self.satellites[0]
         self.ts = load.timescale()
-        self.geocentric = None
-        self.subpoint = None
+        self.ephemeris = None
+        self.eclipse = None
 
     @staticmethod
     def _parse_tle(tle_file_content):
@@ -93,6 +103,10 @@ class SatelliteTracker:
 
         return satellites
 
+    def filter_satellites(self, regime=None, **ranges):
+        """按轨道根数筛选卫星（无需传播），参数同 OrbitElementIndex.query"""
+        return self.index.subset(self.index.query(regime=regime, **ranges))
+
     def select_satellite(self):
         """选择第一个卫星"""
         self.selected_satellite = self.satellites[0]
@@ -131,15 +145,23 @@ class SatelliteTracker:
             current_time += delta
         return time_points_list
 
-    def calculate_positions(self, now_time):
-        """计算卫星位置"""
-        time_array = self.ts.utc(now_time)
-        self.geocentric = self.selected_satellite.at(time_array)
-        self.subpoint = self.geocentric.subpoint()
+    def calculate_positions(self, now_time, satellites=None, dtype=np.float32, shadow_model='conical'):
+        """计算卫星位置及地影状态，satellites 默认为当前选中卫星（可传入筛选结果）"""
+        if satellites is None:
+            satellites = [self.selected_satellite]
+        if not satellites:
+            raise ValueError("没有可计算的卫星（筛选结果为空）")
+        self.ephemeris = Ephemeris.from_satellites(satellites, now_time, self.ts, dtype)
+        self.eclipse = EclipseAnalysis(self.ephemeris, shadow_model)
+
+    def _plot_name(self):
+        """图标题中的卫星名称，多颗卫星时显示首颗名称及数量"""
+        names = self.ephemeris.names
+        return names[0] if len(names) == 1 else f"{names[0]} (+{len(names) - 1})"
 
     def plot_2d_track(self):
         """绘制二维轨迹图"""
-        if not self.subpoint:
+        if not self.ephemeris:
             raise ValueError("Please calculate positions first")
 
         plt.figure(figsize=(12, 6))
@@ -149,33 +171,38 @@ class SatelliteTracker:
         getattr(ax, 'stock_img', lambda: None)()  # type: ignore
         getattr(ax, 'coastlines', lambda: None)()  # type: ignore
 
-        # 绘制轨迹
-        ax.plot(self.subpoint.longitude.degrees,
-                self.subpoint.latitude.degrees,
-                'r-', transform=crs.Geodetic(),
-                linewidth=2, label=self.selected_satellite.name)
-
-        # 标记起终点
-        ax.plot(self.subpoint.longitude.degrees[0],
-                self.subpoint.latitude.degrees[0],
-                'go', transform=crs.Geodetic(),
-                markersize=8, label='Start')
-        ax.plot(self.subpoint.longitude.degrees[-1],
-                self.subpoint.latitude.degrees[-1],
-                'bo', transform=crs.Geodetic(),
-                markersize=8, label='End')
-
-        plt.title(f"{self.selected_satellite.name} 24-hour track prediction")
+        longitude = self.ephemeris.longitude
+        latitude = self.ephemeris.latitude
+        flags = self.eclipse.flags
+        for i, name in enumerate(self.ephemeris.names):
+            # 绘制轨迹，按光照/半影/本影分段着色
+            for flag, (color, state) in SHADOW_STYLES.items():
+                if not (flags[i] == flag).any():
+                    continue
+                ax.plot(shadow_track(longitude[i], flags[i], flag),
+                        shadow_track(latitude[i], flags[i], flag),
+                        '-', color=color, transform=crs.Geodetic(),
+                        linewidth=2, label=f'{name} ({state})')
+
+            # 标记起终点
+            ax.plot(longitude[i, 0], latitude[i, 0],
+                    'go', transform=crs.Geodetic(),
+                    markersize=8, label='Start' if i == 0 else None)
+            ax.plot(longitude[i, -1], latitude[i, -1],
+                    'bo', transform=crs.Geodetic(),
+                    markersize=8, label='End' if i == 0 else None)
+
+        plt.title(f"{self._plot_name()} 24-hour track prediction")
         plt.legend()
         plt.show()
 
     def plot_3d_orbit(self):
         """绘制带经纬线的三维轨道图"""
-        if not self.geocentric:
+        if not self.ephemeris:
             raise ValueError("请先计算卫星位置")
 
         # 获取卫星位置数据
-        position = self.geocentric.position.km
+        positions = self.ephemeris.positions
         earth_radius = 6378.1  # 与地球模型一致的半径
 
         # 创建地球表面
@@ -236,17 +263,24 @@ class SatelliteTracker:
             ))
         # =================================================================
 
-        # 添加卫星轨道
-        figure.add_trace(go.Scatter3d(
-            x=position[0], y=position[1], z=position[2],
-            mode='lines',
-            line={'color': 'red', 'width': 4},
-            name=f'{self.selected_satellite.name} Orbit'
-        ))
+        # 添加卫星轨道，按光照/半影/本影分段着色
+        flags = self.eclipse.flags
+        for i, name in enumerate(self.ephemeris.names):
+            for flag, (color, state) in SHADOW_STYLES.items():
+                if not (flags[i] == flag).any():
+                    continue
+                figure.add_trace(go.Scatter3d(
+                    x=shadow_track(positions[i, :, 0], flags[i], flag),
+                    y=shadow_track(positions[i, :, 1], flags[i], flag),
+                    z=shadow_track(positions[i, :, 2], flags[i], flag),
+                    mode='lines',
+                    line={'color': color, 'width': 4},
+                    name=f'{name} Orbit ({state})'
+                ))
 
         # 设置布局参数
         figure.update_layout(
-            title=f'{self.selected_satellite.name}三维轨道可视化（含经纬网）',
+            title=f'{self._plot_name()}三维轨道可视化（含经纬网）',
             scene={
                 'xaxis': {"visible": True},
                 'yaxis': {"visible": True},
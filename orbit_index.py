@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+author: ZengFanyu
+email: 3024826049@qq.com
+date: 2025/06/05
+
+update:
+V0.4.0
+- add orbital-element index, filter the catalog without propagation
+"""
+from datetime import datetime, timezone
+import numpy as np
+from sgp4.propagation import gstime
+
+
+class OrbitElementIndex:
+    """轨道根数索引：TLE加载时一次性计算派生根数，按排序数组回答范围/组合查询"""
+    # 可查询字段: 周期(min)、半长轴(km)、远/近地点高度(km)、倾角(deg)、升交点赤经(deg)、
+    # 偏心率、历元平经度(deg, 东经为正, 主要用于GEO定点)、历元龄期(天)
+    FIELDS = ('period', 'semi_major_axis', 'apogee', 'perigee', 'inclination',
+              'raan', 'eccentricity', 'longitude', 'epoch_age')
+    # 角度字段允许 low > high 表示跨越 0/360 (或 ±180) 的环绕区间
+    CIRCULAR_FIELDS = ('raan', 'longitude')
+    REGIMES = ('LEO', 'MEO', 'GEO', 'HEO', 'OTHER')
+
+    def __init__(self, satellites, reference_time=None):
+        self.satellites = list(satellites)
+        self.reference_time = reference_time or datetime.now(timezone.utc)
+        count = len(self.satellites)
+        self.values = {field: np.empty(count) for field in self.FIELDS}
+        for i, sat in enumerate(self.satellites):
+            self._fill_record(i, sat.model)
+        self.values['epoch_age'] = self._julian_date(self.reference_time) - self.values['epoch_age']
+        self.regime = self._classify(self.values)
+        # 每个字段保存一次排序，查询时只需二分查找
+        self._order = {field: np.argsort(data, kind='stable') for field, data in self.values.items()}
+        self._sorted = {field: self.values[field][order] for field, order in self._order.items()}
+        # 每种轨道类型的成员编号（升序）
+        self._regime_members = [np.flatnonzero(self.regime == code) for code in range(len(self.REGIMES))]
+
+    def __len__(self):
+        return len(self.satellites)
+
+    def _fill_record(self, i, model):
+        """由SGP4模型填充第i条记录（epoch_age列暂存历元儒略日）"""
+        earth_radius = model.radiusearthkm
+        epoch_jd = model.jdsatepoch + model.jdsatepochF
+        values = self.values
+        values['period'][i] = 2 * np.pi / model.no_kozai
+        values['semi_major_axis'][i] = model.a * earth_radius
+        values['apogee'][i] = model.alta * earth_radius
+        values['perigee'][i] = model.altp * earth_radius
+        values['inclination'][i] = np.degrees(model.inclo)
+        values['raan'][i] = np.degrees(model.nodeo)
+        values['eccentricity'][i] = model.ecco
+        mean_longitude = np.degrees(model.nodeo + model.argpo + model.mo - gstime(epoch_jd))
+        values['longitude'][i] = (mean_longitude + 180.0) % 360.0 - 180.0
+        values['epoch_age'][i] = epoch_jd
+
+    @staticmethod
+    def _julian_date(moment):
+        """datetime转儒略日"""
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return moment.timestamp() / 86400.0 + 2440587.5
+
+    @classmethod
+    def _classify(cls, values):
+        """按周期/偏心率/高度划分轨道类型，返回REGIMES中的编号"""
+        regime = np.full(len(values['period']), cls.REGIMES.index('OTHER'), dtype=np.uint8)
+        apogee, perigee = values['apogee'], values['perigee']
+        eccentricity = values['eccentricity']
+        # 按优先级从低到高写入，后写入的覆盖先写入的
+        regime[(perigee >= 2000.0) & (apogee < 35000.0)] = cls.REGIMES.index('MEO')
+        regime[apogee < 2000.0] = cls.REGIMES.index('LEO')
+        regime[eccentricity >= 0.25] = cls.REGIMES.index('HEO')
+        geo = (values['period'] > 1400.0) & (values['period'] < 1480.0) & (eccentricity < 0.01)
+        regime[geo] = cls.REGIMES.index('GEO')
+        return regime
+
+    def regime_of(self, index):
+        """返回第index颗卫星的轨道类型名称"""
+        return self.REGIMES[self.regime[index]]
+
+    def _span(self, field, low, high):
+        """二分查找字段在排序数组中的[low, high]区间，返回若干(start, stop)切片"""
+        if field not in self._sorted:
+            raise ValueError(f"未知的筛选字段: {field}")
+        sorted_values = self._sorted[field]
+        start = 0 if low is None else np.searchsorted(sorted_values, low, side='left')
+        stop = len(sorted_values) if high is None else np.searchsorted(sorted_values, high, side='right')
+        if low is not None and high is not None and low > high:
+            if field not in self.CIRCULAR_FIELDS:
+                return []
+            # 环绕区间: [low, 最大值] ∪ [最小值, high]
+            return [(start, len(sorted_values)), (0, stop)]
+        return [(start, stop)] if start < stop else []
+
+    def query(self, regime=None, **ranges):
+        """组合查询，返回满足全部条件的卫星编号（升序）
+
+        regime: 轨道类型名称或名称列表，如 'LEO' 或 ('MEO', 'GEO')
+        ranges: 字段=(low, high)，任一端为None表示不设限，如 inclination=(50, 55)、epoch_age=(7, None)
+        """
+        codes = None
+        if regime is not None:
+            names = (regime,) if isinstance(regime, str) else tuple(regime)
+            try:
+                codes = [self.REGIMES.index(name) for name in names]
+            except ValueError as e:
+                raise ValueError(f"未知的轨道类型: {names}") from e
+        spans = {field: self._span(field, *bounds) for field, bounds in ranges.items()}
+        # 以命中数最少的条件生成候选集，其余条件只在候选集上检查
+        narrowest = None
+        if spans:
+            narrowest = min(spans, key=lambda f: sum(stop - start for start, stop in spans[f]))
+            span_count = sum(stop - start for start, stop in spans[narrowest])
+        if codes is not None and (narrowest is None or
+                                  sum(len(self._regime_members[c]) for c in codes) <= span_count):
+            members = [self._regime_members[code] for code in codes]
+            candidates = members[0].copy() if len(members) == 1 else np.sort(np.concatenate(members))
+            narrowest, codes, ordered = None, None, True
+        elif narrowest is not None:
+            order = self._order[narrowest]
+            candidates = np.concatenate([order[start:stop] for start, stop in spans[narrowest]] or
+                                        [np.empty(0, dtype=np.intp)])
+            ordered = False
+        else:
+            candidates = np.arange(len(self.satellites))
+            ordered = True
+        for field, (low, high) in ranges.items():
+            if field == narrowest or candidates.size == 0:
+                continue
+            data = self.values[field][candidates]
+            lower = np.ones(candidates.size, dtype=bool) if low is None else data >= low
+            upper = np.ones(candidates.size, dtype=bool) if high is None else data <= high
+            if low is not None and high is not None and low > high and field in self.CIRCULAR_FIELDS:
+                keep = lower | upper
+            else:
+                keep = lower & upper
+            candidates = candidates[keep]
+        if codes is not None:
+            allowed = np.zeros(len(self.REGIMES), dtype=bool)
+            allowed[codes] = True
+            candidates = candidates[allowed[self.regime[candidates]]]
+        return candidates if ordered else np.sort(candidates)
+
+    def subset(self, indices):
+        """按编号取出卫星对象列表，可直接用于传播/绘图"""
+        return [self.satellites[i] for i in indices]
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""地影区间时长测试：与圆轨道的解析解对比"""
+from datetime import datetime, timezone
+import numpy as np
+import pytest
+from ephemeris import Ephemeris
+from eclipse import EclipseAnalysis, sun_position, EARTH_RADIUS, SUN_RADIUS, AU_KM
+
+EARTH_MU = 398600.4418
+ORBIT_RADIUS = 7000.0
+EPOCH_TT = 2461000.5
+
+
+def circular_orbit_ephemeris(step):
+    """β=0 的圆轨道：轨道面包含历元时刻的太阳方向，t=0 时卫星位于正午点"""
+    period = 2 * np.pi * np.sqrt(ORBIT_RADIUS ** 3 / EARTH_MU)
+    offsets = np.arange(0.0, period + step, step)
+    sun_unit = sun_position(EPOCH_TT) / np.linalg.norm(sun_position(EPOCH_TT))
+    normal = np.cross(sun_unit, [0.0, 0.0, 1.0])
+    normal /= np.linalg.norm(normal)
+    angle = 2 * np.pi * offsets / period
+    positions = ORBIT_RADIUS * (np.cos(angle)[:, None] * sun_unit + np.sin(angle)[:, None] * normal)
+    speed = 2 * np.pi * ORBIT_RADIUS / period
+    velocities = speed * (-np.sin(angle)[:, None] * sun_unit + np.cos(angle)[:, None] * normal)
+    ephemeris = Ephemeris(['circular'], datetime(2025, 11, 19, tzinfo=timezone.utc), EPOCH_TT,
+                          offsets, positions[None].astype(np.float32), velocities[None].astype(np.float32))
+    return ephemeris, period
+
+
+@pytest.mark.parametrize('step', [30.0, 60.0, 300.0])
+def test_cylindrical_eclipse_duration(step):
+    ephemeris, period = circular_orbit_ephemeris(step)
+    analysis = EclipseAnalysis(ephemeris, 'cylindrical')
+    (entry, exit_), = analysis.intervals(0)
+    expected = period * np.arcsin(EARTH_RADIUS / ORBIT_RADIUS) / np.pi
+    assert exit_ - entry == pytest.approx(expected, abs=5.0)
+    assert (entry + exit_) / 2 == pytest.approx(period / 2, abs=5.0)
+
+
+@pytest.mark.parametrize('step', [30.0, 60.0, 300.0])
+def test_conical_eclipse_includes_penumbra(step):
+    ephemeris, period = circular_orbit_ephemeris(step)
+    analysis = EclipseAnalysis(ephemeris, 'conical')
+    (entry, exit_), = analysis.intervals(0)
+    sun_angle = SUN_RADIUS / AU_KM
+    expected = period * (np.arcsin(EARTH_RADIUS / ORBIT_RADIUS) + sun_angle) / np.pi
+    assert exit_ - entry == pytest.approx(expected, abs=5.0)
+    assert np.abs(analysis.beta).max() < 0.1